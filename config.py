@@ -14,19 +14,43 @@ GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
 GROQ_MODEL = "llama3-8b-8192"  # Fast and accurate model
 # Alternative models: "llama3-70b-8192", "mixtral-8x7b-32768", "gemma2-9b-it"
 
+GROQ_REQUESTS_PER_MINUTE = 30  # Groq rate limits for GROQ_MODEL (check your console.groq.com plan)
+GROQ_TOKENS_PER_MINUTE = 30000
+GROQ_CONTENT_TOKEN_BUDGET = 800  # Approx. tokens of website content sent per prompt
+
 # Gemini API Settings (fallback)
 GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent"
 GEMINI_MODEL = "gemini-pro"
 
 # Request Settings
 REQUEST_TIMEOUT = 20
-REQUEST_DELAY = 0.5  # Reduced delay for faster processing with Groq
-MAX_RETRIES = 3
+MAX_RETRIES = 3  # Retries for Groq/Gemini calls on connection errors and RETRY_STATUS_CODES
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_BACKOFF_JITTER = 0.3
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+HTTP_POOL_SIZE = 32  # Pooled keep-alive connections per host
+DOMAIN_PROBE_WORKERS = 10  # Concurrent HEAD probes when guessing company domains
+ENRICH_CONCURRENCY = 8  # Companies enriched in parallel
+ENRICH_PROCESSES = 1  # Worker processes for CSV runs; raise (e.g. os.cpu_count()) when parsing is the bottleneck
+DNS_CACHE_TTL = 300  # Seconds to reuse a resolved hostname
+DNS_NEGATIVE_CACHE_TTL = 60  # Seconds to remember hostnames that don't exist
+DNS_CACHE_SIZE = 4096
+LLM_HEDGE_DELAY = 2.0  # Seconds to wait on Groq before also asking Gemini
+LOOKUP_CACHE_SIZE = 4096  # Websites / scraped pages remembered per run
+JUNK_PAGE_TTL = 3600  # Seconds to skip the LLMs for a page they answered without a summary
+LLM_CACHE_PATH = ".llm_cache.sqlite3"  # Persistent cache of LLM answers; None disables it
+LLM_CACHE_TTL = 30 * 86400  # Seconds before a cached LLM answer is asked for again
+LLM_CACHE_MAX_ENTRIES = 100_000  # Oldest answers are evicted beyond this
+ENRICHMENT_CACHE_PATH = "data/enrich_cache.sqlite3"  # Web app cache of enriched companies
+ENRICHMENT_CACHE_TTL = 7 * 86400  # Seconds before a cached company is enriched again
 
 # Web Scraping Settings
 USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
 MAX_CONTENT_LENGTH = 4000  # Increased for better context
 MIN_CONTENT_LENGTH = 50    # Reduced minimum
+HTML_PARSER = 'lxml'       # C-backed parser for BeautifulSoup (much faster than html.parser)
+MIN_LLM_CONTENT_LENGTH = 200  # Below this, scraped content isn't worth an LLM call
+PARKED_PROBE_BYTES = 8192  # Bytes read from a probed domain to spot parked pages
 
 # Common domain patterns for company website discovery
 DOMAIN_PATTERNS = [
@@ -50,6 +74,35 @@ SKIP_DOMAINS = [
     'bing.com', 'google.com', 'yahoo.com', 'pinterest.com'
 ]
 
+# Phrases that mark a domain as parked or for sale
+PARKED_DOMAIN_INDICATORS = ['domain for sale', 'parked domain', 'buy this domain', 'domain expired']
+
+# Industry guesses by top-level domain, used when a page is too thin to analyze
+DOMAIN_INDUSTRY_HINTS = {
+    '.edu': 'Education',
+    '.gov': 'Government',
+    '.org': 'Non-profit',
+    '.health': 'Healthcare',
+    '.bank': 'Finance',
+    '.ai': 'Technology',
+    '.io': 'Technology',
+    '.dev': 'Technology'
+}
+
+# Keyword patterns (regex alternations) for classifying obvious industries without the LLM
+INDUSTRY_KEYWORDS = {
+    r'saas|software|cloud|developers?|api|platform': 'Technology',
+    r'clinics?|hospitals?|patients?|healthcare|medical|pharma\w*': 'Healthcare',
+    r'fintech|banking|payments?|insurance|lending|investments?': 'Finance',
+    r'e-?commerce|retail|online store|shopping': 'Retail',
+    r'manufactur\w*|factory|factories|industrial': 'Manufacturing',
+    r'universit(?:y|ies)|schools?|students?|courses|e-?learning': 'Education',
+    r'logistics|shipping|freight|supply chain': 'Logistics',
+    r'real estate|propert(?:y|ies)|mortgages?': 'Real Estate'
+}
+INDUSTRY_MIN_KEYWORD_HITS = 3     # Keyword matches needed before trusting the local guess
+INDUSTRY_MIN_CONFIDENCE = 0.6     # Share of all matches that must point to the top industry
+
 # HTML elements to remove during scraping
 REMOVE_ELEMENTS = ["script", "style", "nav", "footer", "header", "aside", "iframe", "noscript"]
 
@@ -76,6 +129,19 @@ Provide a JSON response with exactly these fields:
 
 Respond only with valid JSON, no additional text:"""
 
+# Groq prompt template when the industry is already known (shorter output)
+GROQ_PITCH_PROMPT = """You are a business intelligence expert. Analyze the company information below and provide insights.
+
+Company: {company_name}
+Industry: {industry}
+Website Content: {website_content}
+
+Provide a JSON response with exactly these fields:
+- "summary": 2-3 sentences describing what the company does, their main products/services
+- "automation_pitch": 2-3 sentences describing a specific AI automation solution for this company
+
+Respond only with valid JSON, no additional text:"""
+
 # Gemini prompt template (fallback)
 GEMINI_ANALYSIS_PROMPT = """
 Analyze the following company information:
@@ -132,6 +198,8 @@ LOGGING_CONFIG = {
 DEFAULT_INPUT_FILE = "input_companies.csv"
 DEFAULT_OUTPUT_FILE = "enriched_companies.csv"
 LOG_FILE = "enrichment_bot.log"
+CSV_CHUNK_SIZE = 1000  # Input rows read (and enriched) per batch
+UPLOAD_CHUNK_SIZE = 50_000  # Uploaded CSV rows parsed per chunk in the web app
 
 # Validation settings
 REQUIRED_CSV_COLUMNS = ["company_name"]
@@ -1,20 +1,303 @@
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
+import trafilatura
 import time
 import json
+import csv
+import sqlite3
 import re
 from urllib.parse import urljoin, urlparse
 import logging
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import os
+import hashlib
+import socket
+import threading
 from dataclasses import dataclass
+from collections import Counter
+from functools import lru_cache
+from cachetools import LRUCache, TTLCache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from config import *  # Import all configuration settings
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns used on every company
+_NON_ALNUM_RE = re.compile(r'[^a-zA-Z0-9]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_WORD_RE = re.compile(r'\w+')
+_JSON_DECODER = json.JSONDecoder()
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+_CONTENT_SELECTOR = ', '.join(CONTENT_SELECTORS)
+_INDUSTRY_GROUPS = {f"industry{idx}": pattern for idx, pattern in enumerate(INDUSTRY_KEYWORDS)}
+_INDUSTRY_RE = re.compile(
+    '|'.join(f"(?P<{group}>\\b(?:{pattern})\\b)" for group, pattern in _INDUSTRY_GROUPS.items()),
+    re.IGNORECASE
+)
+_SKIP_DOMAIN_RE = re.compile(r'(?:^|\.)(?:' + '|'.join(re.escape(d) for d in SKIP_DOMAINS) + r')$')
+_PARKED_DOMAIN_RE = re.compile('|'.join(re.escape(i) for i in PARKED_DOMAIN_INDICATORS), re.IGNORECASE)
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (~4 characters per token for English text)"""
+    return len(text) // 4 + 1
+
+def select_informative_content(company_name: str, content: str, token_budget: int) -> str:
+    """Keep the most informative sentences of scraped content within a token budget"""
+    if estimate_tokens(content) <= token_budget:
+        return content
+    
+    # Repeated sentences (menus, cookie banners) only count once
+    sentences = list(dict.fromkeys(sentence for sentence in _SENTENCE_END_RE.split(content) if sentence))
+    sentence_words = [set(_WORD_RE.findall(sentence.lower())) for sentence in sentences]
+    
+    # Words repeated across sentences are the page's topic; nav/boilerplate fragments rarely are
+    sentence_freq = Counter(word for words in sentence_words for word in words if len(word) > 3)
+    name_words = {word for word in _WORD_RE.findall(company_name.lower()) if len(word) > 2}
+    
+    scores = []
+    for idx, words in enumerate(sentence_words):
+        if not words:
+            continue
+        keyword_hits = sum(1 for word in words if sentence_freq[word] > 1)
+        keyword_hits += 3 * len(words & name_words)
+        scores.append((keyword_hits / len(words) ** 0.5, idx))
+    
+    selected = []
+    used_tokens = 0
+    for _, idx in sorted(scores, reverse=True):
+        sentence_tokens = estimate_tokens(sentences[idx])
+        if used_tokens + sentence_tokens > token_budget:
+            continue
+        selected.append(idx)
+        used_tokens += sentence_tokens
+    
+    # Unpunctuated text (e.g. selector-fallback headings) can be one oversized "sentence";
+    # fall back to a plain cut at the budget rather than sending nothing
+    if not selected:
+        excerpt = content[:max(1, token_budget - 1) * 4]
+        if ' ' in excerpt.strip():
+            excerpt = excerpt.rstrip().rsplit(' ', 1)[0]
+        return excerpt
+    
+    # Keep the original order so the excerpt still reads naturally
+    return ' '.join(sentences[idx] for idx in sorted(selected))
+
+@lru_cache(maxsize=LOOKUP_CACHE_SIZE)
+def significant_name_words(company_name: str) -> Tuple[str, ...]:
+    """Words of a company name long enough to identify it in a domain"""
+    return tuple(word for word in _WORD_RE.findall(company_name.lower()) if len(word) > 3)
+
+def domain_name_variant(company_name: str) -> List[str]:
+    """Cleaned forms of a company name to guess domains from"""
+    clean_name_variations = [
+        _NON_ALNUM_RE.sub('', company_name.lower()),
+        company_name.lower().replace(' ', '').replace('.', '').replace(',', ''),
+        company_name.lower().split()[0] if ' ' in company_name else company_name.lower(),
+    ]
+    
+    # Remove duplicates while preserving order
+    return list(dict.fromkeys(clean_name_variations))
+
+def domain_name_variants(company_names: pd.Series) -> List[List[str]]:
+    """Vectorized domain_name_variant for a whole column of names"""
+    lowered = company_names.astype(str).str.lower()
+    alnum = lowered.str.replace(r'[^a-z0-9]', '', regex=True)
+    compact = lowered.str.replace(r'[ .,]', '', regex=True)
+    first_word = lowered.str.split().str[0].where(lowered.str.contains(' ', regex=False), lowered)
+    return [list(dict.fromkeys(variants)) for variants in zip(alnum, compact, first_word)]
+
+def extract_json_object(content: str) -> Optional[dict]:
+    """Parse the first JSON object embedded in an LLM response, or None"""
+    # raw_decode stops at the end of the object, so trailing chatter is ignored
+    start = content.find('{')
+    while start != -1:
+        try:
+            data, _ = _JSON_DECODER.raw_decode(content, start)
+            if isinstance(data, dict):
+                return data
+        except json.JSONDecodeError:
+            pass
+        start = content.find('{', start + 1)
+    return None
+
+def classify_industry(content: str) -> Optional[str]:
+    """Keyword-based industry guess, or None when the keywords don't clearly agree"""
+    hits = Counter(INDUSTRY_KEYWORDS[_INDUSTRY_GROUPS[match.lastgroup]] for match in _INDUSTRY_RE.finditer(content))
+    if not hits:
+        return None
+    
+    industry, top_hits = hits.most_common(1)[0]
+    if top_hits >= INDUSTRY_MIN_KEYWORD_HITS and top_hits / sum(hits.values()) >= INDUSTRY_MIN_CONFIDENCE:
+        return industry
+    return None
+
+def llm_cache_key(model: str, prompt: str) -> str:
+    """Content address for an LLM request"""
+    return hashlib.blake2b(f"{model}|{prompt}".encode('utf-8'), digest_size=16).hexdigest()
+
+def content_fingerprint(content: str) -> str:
+    """Short hash of the start of a page, used to recognise repeat low-signal content"""
+    return hashlib.blake2b(content[:512].encode('utf-8'), digest_size=8).hexdigest()
+
+def guess_industry_from_domain(url: str) -> str:
+    """Template industry guess from the website's top-level domain"""
+    domain = urlparse(url).netloc.lower()
+    for suffix, industry in DOMAIN_INDUSTRY_HINTS.items():
+        if domain.endswith(suffix):
+            return industry
+    return "Unknown"
+
+# Process-wide DNS cache: domain probing resolves many sibling hostnames per company
+_original_getaddrinfo = socket.getaddrinfo
+_dns_cache: Dict[tuple, tuple] = {}
+_dns_cache_lock = threading.Lock()
+
+def _cached_getaddrinfo(*args, **kwargs):
+    """socket.getaddrinfo with a TTL cache, including NXDOMAIN answers"""
+    key = args + tuple(sorted(kwargs.items()))
+    now = time.monotonic()
+    
+    with _dns_cache_lock:
+        entry = _dns_cache.get(key)
+    if entry and entry[0] > now:
+        result = entry[1]
+        if isinstance(result, socket.gaierror):
+            raise socket.gaierror(*result.args)
+        return result
+    
+    try:
+        result = _original_getaddrinfo(*args, **kwargs)
+        expires_at = now + DNS_CACHE_TTL
+    except socket.gaierror as e:
+        # Only remember definitive "no such host" answers, not transient failures
+        if e.errno != socket.EAI_NONAME:
+            raise
+        result = e
+        expires_at = now + DNS_NEGATIVE_CACHE_TTL
+    
+    with _dns_cache_lock:
+        _dns_cache.pop(key, None)
+        if len(_dns_cache) >= DNS_CACHE_SIZE:
+            # Dicts keep insertion order, so this drops the oldest entry
+            _dns_cache.pop(next(iter(_dns_cache)))
+        _dns_cache[key] = (expires_at, result)
+    
+    if isinstance(result, socket.gaierror):
+        raise result
+    return result
+
+def enable_dns_cache():
+    """Install the DNS cache (safe to call more than once)"""
+    socket.getaddrinfo = _cached_getaddrinfo
+
+class TokenBucket:
+    """Thread-safe token bucket: acquire() only sleeps when the budget is spent"""
+    
+    def __init__(self, capacity: float, per_seconds: float):
+        self.capacity = capacity
+        self.rate = capacity / per_seconds
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._resume_at = 0.0  # Set by pause(); nobody gets tokens before this
+        self._lock = threading.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def acquire(self, tokens: float = 1):
+        # A single request larger than the bucket still has to go through eventually
+        tokens = min(tokens, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                paused_for = self._resume_at - self._updated
+                if paused_for <= 0 and self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = max(paused_for, (tokens - self._tokens) / self.rate)
+            time.sleep(wait)
+    
+    def observe_remaining(self, remaining: float):
+        """Clamp the local budget to what the server says is left"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, remaining)
+    
+    def pause(self, seconds: float):
+        """Hold every caller back for `seconds`, e.g. after a 429 with Retry-After"""
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+class ResponseCache:
+    """Persistent JSON key/value store on SQLite, shareable between threads and processes"""
+    
+    PRUNE_EVERY = 500  # Writes between evictions of expired / excess entries
+    
+    def __init__(self, path: str, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        self.ttl = ttl  # Seconds before an entry counts as stale (None = never)
+        self.max_entries = max_entries  # Oldest entries are evicted beyond this (None = unbounded)
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_created_at ON cache (created_at)")
+            self._prune()
+    
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+    
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None or (self.ttl is not None and time.time() - row[1] > self.ttl):
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+    
+    def set(self, key: str, value: dict):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time())
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                self._prune()
+    
+    def _prune(self):
+        """Drop expired entries and the oldest ones past max_entries (caller holds the lock)"""
+        if self.ttl is not None:
+            self._conn.execute("DELETE FROM cache WHERE created_at < ?", (time.time() - self.ttl,))
+        if self.max_entries is not None:
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
 @dataclass
 class CompanyData:
     name: str
@@ -24,6 +307,7 @@ class CompanyData:
     hq_location: str = ""
     summary: str = ""
     automation_pitch: str = ""
+    cacheable: bool = True  # False for placeholder/error results that skipped the LLM
 
 class LeadEnrichmentBot:
     def __init__(self, groq_api_key: str = None, gemini_api_key: str = None):
@@ -33,21 +317,95 @@ class LeadEnrichmentBot:
         
         # Session for web requests
         self.session = requests.Session()
-        self.session.headers.update({'User-Agent': USER_AGENT})
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            # Advertise every encoding urllib3 can decode here (adds br when Brotli is installed)
+            'Accept-Encoding': ACCEPT_ENCODING
+        })
+        
+        # Keep connections to the LLM APIs (and probed sites) alive between companies.
+        # Every enrichment worker may talk to the same API host at once, so the
+        # per-host pool must hold at least that many connections or they get discarded.
+        pool_size = max(HTTP_POOL_SIZE, ENRICH_CONCURRENCY)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+        # LLM APIs get bounded retries with jittered backoff (domain probes must fail fast)
+        api_retry = Retry(
+            total=MAX_RETRIES,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            backoff_jitter=RETRY_BACKOFF_JITTER,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(['GET', 'HEAD', 'POST']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        api_adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=api_retry)
+        for api_url in (GROQ_API_URL, GEMINI_API_URL):
+            parsed = urlparse(api_url)
+            self.session.mount(f"{parsed.scheme}://{parsed.netloc}/", api_adapter)
+        
+        enable_dns_cache()
+        
+        # Lookups reused for repeated company names / websites within a run
+        self._website_cache = LRUCache(maxsize=LOOKUP_CACHE_SIZE)
+        self._content_cache = LRUCache(maxsize=LOOKUP_CACHE_SIZE)
+        self._cache_lock = threading.Lock()
+        
+        # Fingerprints of scraped pages the LLMs answered for but couldn't summarize
+        # (guarded by _cache_lock; entries expire so a page gets another chance)
+        self._junk_fingerprints = TTLCache(maxsize=LOOKUP_CACHE_SIZE, ttl=JUNK_PAGE_TTL)
+        
+        # Groq rate limits, shared by all threads (split between worker processes)
+        processes = max(1, ENRICH_PROCESSES)
+        self._groq_requests = TokenBucket(GROQ_REQUESTS_PER_MINUTE / processes, per_seconds=60)
+        self._groq_tokens = TokenBucket(GROQ_TOKENS_PER_MINUTE / processes, per_seconds=60)
+        
+        # Parsed LLM answers keyed by model + prompt, persisted across runs
+        self._llm_cache = (
+            ResponseCache(LLM_CACHE_PATH, ttl=LLM_CACHE_TTL, max_entries=LLM_CACHE_MAX_ENTRIES)
+            if LLM_CACHE_PATH else None
+        )
         
         # Validate API keys
         if not self.groq_api_key or self.groq_api_key == "your_groq_api_key_here":
             logger.warning("No valid Groq API key provided, will use Gemini as fallback")
             if not self.gemini_api_key:
                 logger.error("No valid API keys provided!")
+    
+    def _cached_lookup(self, cache: LRUCache, key: str, lookup: Callable[[], str], use_cache: bool = True) -> str:
+        """Return a cached lookup result, running the lookup on a miss (empty results aren't cached)
         
-    def search_company_website(self, company_name: str) -> str:
+        With use_cache=False the lookup always runs and its result replaces the cached one.
+        """
+        if use_cache:
+            with self._cache_lock:
+                value = cache.get(key)
+            if value is not None:
+                return value
+        
+        value = lookup()
+        if value:
+            with self._cache_lock:
+                cache[key] = value
+        return value
+    
+    def search_company_website(self, company_name: str, name_variants: Optional[List[str]] = None,
+                               use_cache: bool = True) -> str:
+        """Search for company website, reusing earlier results for the same name"""
+        key = company_name.strip().lower()
+        return self._cached_lookup(
+            self._website_cache, key, lambda: self._find_company_website(company_name, name_variants), use_cache
+        )
+    
+    def _find_company_website(self, company_name: str, name_variants: Optional[List[str]] = None) -> str:
         """Search for company website using multiple strategies"""
         logger.info(f"Searching website for: {company_name}")
         
         try:
             # Strategy 1: Try common domain patterns
-            website = self._try_common_domains(company_name)
+            website = self._try_common_domains(company_name, name_variants)
             if website:
                 logger.info(f"Found via common domains: {website}")
                 return website
@@ -65,50 +423,71 @@ class LeadEnrichmentBot:
             logger.error(f"Error finding website for {company_name}: {e}")
             return ""
     
-    def _try_common_domains(self, company_name: str) -> str:
-        """Try common domain patterns"""
-        # Clean company name for domain testing
-        clean_name_variations = [
-            re.sub(r'[^a-zA-Z0-9]', '', company_name.lower()),
-            company_name.lower().replace(' ', '').replace('.', '').replace(',', ''),
-            company_name.lower().split()[0] if ' ' in company_name else company_name.lower(),
-        ]
+    def _try_common_domains(self, company_name: str, name_variants: Optional[List[str]] = None) -> str:
+        """Try common domain patterns, probing all candidates concurrently"""
+        # process_csv precomputes the variants for a whole batch of names
+        clean_names = name_variants if name_variants is not None else domain_name_variant(company_name)
         
-        # Remove duplicates while preserving order
-        clean_names = list(dict.fromkeys(clean_name_variations))
+        candidates = [
+            pattern.format(company=clean_name)
+            for clean_name in clean_names
+            if len(clean_name) >= 2  # Skip very short names
+            for pattern in DOMAIN_PATTERNS
+        ]
+        if not candidates:
+            return ""
         
-        for clean_name in clean_names:
-            if len(clean_name) < 2:  # Skip very short names
-                continue
-                
-            potential_domains = [
-                f"https://www.{clean_name}.com",
-                f"https://{clean_name}.com",
-                f"https://www.{clean_name}.io",
-                f"https://{clean_name}.io",
-                f"https://www.{clean_name}.co",
-                f"https://{clean_name}.co",
-                f"https://www.{clean_name}.net",
-                f"https://{clean_name}.net",
-                f"https://www.{clean_name}.org",
-                f"https://{clean_name}.org"
+        # Fire cheap HEAD probes in parallel; only responding hosts get a full GET.
+        # Results are checked in candidate order so .com / the full name still win
+        # over later patterns that happen to answer faster.
+        executor = ThreadPoolExecutor(max_workers=min(DOMAIN_PROBE_WORKERS, len(candidates)))
+        try:
+            futures = [
+                executor.submit(self.session.head, domain, timeout=REQUEST_TIMEOUT, allow_redirects=True)
+                for domain in candidates
             ]
             
-            for domain in potential_domains:
+            for domain, future in zip(candidates, futures):
                 try:
-                    response = self.session.get(domain, timeout=REQUEST_TIMEOUT, allow_redirects=True)
-                    if response.status_code == 200 and len(response.content) > 1000:
-                        # Check if it's not a parked domain
-                        content = response.text.lower()
-                        parked_indicators = ['domain for sale', 'parked domain', 'buy this domain', 'domain expired']
-                        if not any(indicator in content for indicator in parked_indicators):
-                            return domain
+                    response = future.result()
                 except Exception as e:
                     logger.debug(f"Domain {domain} failed: {e}")
                     continue
+                
+                # Some servers reject HEAD outright, so let the GET decide for those
+                if response.status_code != 200 and response.status_code not in (405, 501):
+                    continue
+                
+                if self._is_live_company_domain(domain):
+                    return domain
+        finally:
+            # Don't wait on the slower probes once we have an answer
+            executor.shutdown(wait=False, cancel_futures=True)
         
         return ""
     
+    def _is_live_company_domain(self, domain: str) -> bool:
+        """Fetch a probed domain and make sure it serves a real, non-parked site"""
+        try:
+            response = self.session.get(domain, timeout=REQUEST_TIMEOUT, allow_redirects=True, stream=True)
+            try:
+                if response.status_code != 200:
+                    return False
+                # The top of the page is enough for the size and parked-domain checks
+                page_head = response.raw.read(PARKED_PROBE_BYTES, decode_content=True)
+            finally:
+                response.close()
+            
+            if len(page_head) > 1000:
+                # Check if it's not a parked domain
+                content = page_head.decode('utf-8', 'ignore')
+                if _PARKED_DOMAIN_RE.search(content) is None:
+                    return True
+        except Exception as e:
+            logger.debug(f"Domain {domain} failed: {e}")
+        
+        return False
+    
     def _search_via_web(self, company_name: str) -> str:
         """Search for company website using web search"""
         try:
@@ -120,7 +499,7 @@ class LeadEnrichmentBot:
             if response.status_code != 200:
                 return ""
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, HTML_PARSER)
             
             # Look for search results
             for link in soup.find_all('a', href=True):
@@ -142,56 +521,42 @@ class LeadEnrichmentBot:
     def _is_likely_company_website(self, url: str, company_name: str) -> bool:
         """Check if URL is likely the company's official website"""
         try:
-            parsed = urlparse(url)
-            domain = parsed.netloc.lower()
+            domain = urlparse(url).hostname or ''
             
-            # Skip unwanted domains
-            if any(skip_domain in domain for skip_domain in SKIP_DOMAINS):
+            # Skip unwanted domains (and their subdomains)
+            if _SKIP_DOMAIN_RE.search(domain):
                 return False
             
-            # Check if company name parts are in domain
-            company_words = re.findall(r'\w+', company_name.lower())
-            domain_clean = re.sub(r'[^a-zA-Z0-9]', '', domain)
-            
             # If any significant word from company name is in domain
-            for word in company_words:
-                if len(word) > 3 and word in domain_clean:
-                    return True
-            
-            return False
+            domain_clean = _NON_ALNUM_RE.sub('', domain)
+            return any(word in domain_clean for word in significant_name_words(company_name))
         except:
             return False
     
-    def scrape_website_content(self, url: str) -> str:
+    def scrape_website_content(self, url: str, use_cache: bool = True) -> str:
+        """Scrape website content, reusing earlier results for the same URL"""
+        key = url.strip().rstrip('/').lower()
+        return self._cached_lookup(self._content_cache, key, lambda: self._scrape_website_content(url), use_cache)
+    
+    def _scrape_website_content(self, url: str) -> str:
         """Scrape and extract meaningful content from website"""
         try:
             logger.info(f"Scraping content from: {url}")
             response = self.session.get(url, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove unwanted elements
-            for element in soup(REMOVE_ELEMENTS):
-                element.decompose()
-            
-            # Extract content from specific areas
-            content_areas = []
-            
-            # Try content selectors in order of priority
-            for selector in CONTENT_SELECTORS:
-                try:
-                    elements = soup.select(selector)
-                    for element in elements:
-                        text = element.get_text(strip=True)
-                        if len(text) > MIN_CONTENT_LENGTH:
-                            content_areas.append(text)
-                except:
-                    continue
+            # Main-content extraction drops nav/boilerplate; selectors are the fallback
+            full_text = trafilatura.extract(
+                response.text,
+                include_comments=False,
+                include_tables=False,
+                favor_precision=True
+            )
+            if not full_text:
+                logger.debug(f"trafilatura found no main content on {url}, using selectors")
+                full_text = self._extract_with_selectors(response.content)
             
-            # Combine and clean content
-            full_text = ' '.join(content_areas)
-            full_text = re.sub(r'\s+', ' ', full_text).strip()
+            full_text = _WHITESPACE_RE.sub(' ', full_text).strip()
             
             # Limit content length
             content = full_text[:MAX_CONTENT_LENGTH] if full_text else ""
@@ -203,9 +568,115 @@ class LeadEnrichmentBot:
             logger.error(f"Error scraping {url}: {e}")
             return ""
     
-    def analyze_with_groq(self, company_name: str, website_content: str) -> Dict[str, str]:
-        """Use Groq API to analyze company and generate insights"""
-        if not self.groq_api_key or self.groq_api_key == "your_groq_api_key_here":
+    def _extract_with_selectors(self, html: bytes) -> str:
+        """Collect text from the common content areas of a page"""
+        soup = BeautifulSoup(html, HTML_PARSER)
+        
+        # Remove unwanted elements
+        for element in soup(REMOVE_ELEMENTS):
+            element.decompose()
+        
+        # Extract content from specific areas
+        content_areas = []
+        included = set()
+        
+        # One pass over the DOM for all selectors; matches come back in document order
+        for element in soup.select(_CONTENT_SELECTOR):
+            # Skip nodes whose text is already covered by an included ancestor
+            if any(id(parent) in included for parent in element.parents):
+                continue
+            text = element.get_text(strip=True)
+            if len(text) > MIN_CONTENT_LENGTH:
+                included.add(id(element))
+                content_areas.append(text)
+        
+        return ' '.join(content_areas)
+    
+    def _cached_analysis(self, cache_key: str, use_cache: bool = True) -> Optional[Dict[str, str]]:
+        """Look up a previously stored LLM analysis"""
+        if self._llm_cache is None or not use_cache:
+            return None
+        try:
+            return self._llm_cache.get(cache_key)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+    
+    def _remember_analysis(self, cache_key: str, analysis: Dict[str, str]) -> Dict[str, str]:
+        """Store a useful LLM analysis (one with a summary) and pass it through"""
+        if not analysis.get("summary"):
+            # The provider did answer, so the page itself is the problem (not an outage)
+            return {**analysis, "unsummarizable": True}
+        
+        if self._llm_cache is not None:
+            try:
+                self._llm_cache.set(cache_key, analysis)
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache write failed: {e}")
+        return analysis
+    
+    def _observe_groq_limits(self, response):
+        """Tune the Groq buckets from the rate-limit headers of a response"""
+        # Groq reports what's left of the per-minute token budget; never assume more than that.
+        # (Its remaining-requests header counts per day, so it says nothing about the minute bucket.)
+        remaining_tokens = response.headers.get('x-ratelimit-remaining-tokens')
+        if remaining_tokens:
+            try:
+                self._groq_tokens.observe_remaining(float(remaining_tokens))
+            except ValueError:
+                pass
+        
+        # Still rate limited after the adapter's own retries: stop every worker, not just this one
+        if response.status_code == 429:
+            try:
+                retry_after = float(response.headers.get('retry-after', ''))
+            except ValueError:
+                retry_after = RETRY_BACKOFF_FACTOR * 2 ** MAX_RETRIES
+            logger.warning(f"Groq rate limit hit, pausing requests for {retry_after:.1f}s")
+            self._groq_requests.pause(retry_after)
+            self._groq_tokens.pause(retry_after)
+    
+    def _groq_available(self) -> bool:
+        return bool(self.groq_api_key) and self.groq_api_key != "your_groq_api_key_here"
+    
+    def _groq_prompt(self, company_name: str, website_content: str, industry: Optional[str]) -> str:
+        """Prompt for Groq (summary + pitch only if industry is known)"""
+        content_excerpt = select_informative_content(company_name, website_content, GROQ_CONTENT_TOKEN_BUDGET)
+        if industry:
+            return GROQ_PITCH_PROMPT.format(
+                company_name=company_name,
+                industry=industry,
+                website_content=content_excerpt
+            )
+        return GROQ_ANALYSIS_PROMPT.format(
+            company_name=company_name,
+            website_content=content_excerpt
+        )
+    
+    def _reserve_groq_budget(self, prompt: str):
+        """Take a request and the prompt's tokens from the Groq buckets (only blocks once they're spent)"""
+        self._groq_requests.acquire()
+        self._groq_tokens.acquire(estimate_tokens(prompt))
+    
+    def analyze_with_groq(self, company_name: str, website_content: str, industry: Optional[str] = None,
+                          use_cache: bool = True) -> Dict[str, str]:
+        """Use Groq API to analyze company and generate insights (summary + pitch only if industry is known)"""
+        if not self._groq_available():
+            return {"summary": "", "automation_pitch": "", "industry": ""}
+        
+        prompt = self._groq_prompt(company_name, website_content, industry)
+        cached = self._cached_analysis(llm_cache_key(GROQ_MODEL, prompt), use_cache)
+        if cached:
+            logger.info(f"Using cached Groq analysis for {company_name}")
+            return cached
+        
+        self._reserve_groq_budget(prompt)
+        return self._request_groq_analysis(company_name, prompt)
+    
+    def _request_groq_analysis(self, company_name: str, prompt: str, settled: Optional[threading.Event] = None) -> Dict[str, str]:
+        """Send a prompt whose rate-limit budget is already reserved to Groq"""
+        # A hedge that was decided while this call was queued doesn't need Groq any more
+        if settled is not None and settled.is_set():
             return {"summary": "", "automation_pitch": "", "industry": ""}
         
         try:
@@ -215,11 +686,7 @@ class LeadEnrichmentBot:
                 "Authorization": f"Bearer {self.groq_api_key}",
                 "Content-Type": "application/json"
             }
-            
-            prompt = GROQ_ANALYSIS_PROMPT.format(
-                company_name=company_name,
-                website_content=website_content[:3000]  # Limit content for API
-            )
+            cache_key = llm_cache_key(GROQ_MODEL, prompt)
             
             payload = {
                 "model": GROQ_MODEL,
@@ -239,7 +706,8 @@ class LeadEnrichmentBot:
                 "stream": False
             }
             
-            response = requests.post(GROQ_API_URL, json=payload, headers=headers, timeout=30)
+            response = self.session.post(GROQ_API_URL, json=payload, headers=headers, timeout=30)
+            self._observe_groq_limits(response)
             response.raise_for_status()
             
             result = response.json()
@@ -249,29 +717,23 @@ class LeadEnrichmentBot:
                 content = result['choices'][0]['message']['content'].strip()
                 logger.info(f"Raw Groq response: {content[:200]}...")
                 
-                # Parse JSON response
-                try:
-                    # Clean the response
-                    content = content.replace('```json', '').replace('```', '').strip()
+                # Clean the response
+                content = content.replace('```json', '').replace('```', '').strip()
+                
+                # Find and parse JSON
+                json_data = extract_json_object(content)
+                if json_data is not None:
+                    result_data = {
+                        "summary": json_data.get("summary", "").strip(),
+                        "industry": json_data.get("industry", "").strip(),
+                        "automation_pitch": json_data.get("automation_pitch", "").strip()
+                    }
                     
-                    # Find and parse JSON
-                    json_match = re.search(r'\{.*\}', content, re.DOTALL)
-                    if json_match:
-                        json_str = json_match.group()
-                        json_data = json.loads(json_str)
-                        
-                        result_data = {
-                            "summary": json_data.get("summary", "").strip(),
-                            "industry": json_data.get("industry", "").strip(),
-                            "automation_pitch": json_data.get("automation_pitch", "").strip()
-                        }
-                        
-                        logger.info(f"Successfully parsed Groq response for {company_name}")
-                        return result_data
-                        
-                except json.JSONDecodeError as e:
-                    logger.warning(f"JSON parsing failed for {company_name}, trying fallback: {e}")
-                    return self._parse_text_response(content)
+                    logger.info(f"Successfully parsed Groq response for {company_name}")
+                    return self._remember_analysis(cache_key, result_data)
+                
+                logger.warning(f"JSON parsing failed for {company_name}, trying fallback")
+                return self._remember_analysis(cache_key, self._parse_text_response(content))
             
             logger.warning(f"No valid response from Groq for {company_name}")
             return {"summary": "", "automation_pitch": "", "industry": ""}
@@ -280,7 +742,7 @@ class LeadEnrichmentBot:
             logger.error(f"Groq API error for {company_name}: {e}")
             return {"summary": "", "automation_pitch": "", "industry": ""}
     
-    def analyze_with_gemini(self, company_name: str, website_content: str) -> Dict[str, str]:
+    def analyze_with_gemini(self, company_name: str, website_content: str, use_cache: bool = True) -> Dict[str, str]:
         """Use Gemini API as fallback"""
         if not self.gemini_api_key:
             return {"summary": "", "automation_pitch": "", "industry": ""}
@@ -295,6 +757,12 @@ class LeadEnrichmentBot:
                 website_content=website_content[:2000]
             )
             
+            cache_key = llm_cache_key(GEMINI_MODEL, prompt)
+            cached = self._cached_analysis(cache_key, use_cache)
+            if cached:
+                logger.info(f"Using cached Gemini analysis for {company_name}")
+                return cached
+            
             payload = {
                 "contents": [{
                     "parts": [{"text": prompt}]
@@ -305,7 +773,7 @@ class LeadEnrichmentBot:
                 }
             }
             
-            response = requests.post(url, json=payload, timeout=30)
+            response = self.session.post(url, json=payload, timeout=30)
             response.raise_for_status()
             
             result = response.json()
@@ -314,19 +782,15 @@ class LeadEnrichmentBot:
                 content = result['candidates'][0]['parts'][0]['text'].strip()
                 
                 # Try to parse JSON
-                try:
-                    json_match = re.search(r'\{.*\}', content, re.DOTALL)
-                    if json_match:
-                        json_data = json.loads(json_match.group())
-                        return {
-                            "summary": json_data.get("summary", "").strip(),
-                            "industry": json_data.get("industry", "").strip(),
-                            "automation_pitch": json_data.get("automation_pitch", "").strip()
-                        }
-                except json.JSONDecodeError:
-                    pass
+                json_data = extract_json_object(content)
+                if json_data is not None:
+                    return self._remember_analysis(cache_key, {
+                        "summary": json_data.get("summary", "").strip(),
+                        "industry": json_data.get("industry", "").strip(),
+                        "automation_pitch": json_data.get("automation_pitch", "").strip()
+                    })
                 
-                return self._parse_text_response(content)
+                return self._remember_analysis(cache_key, self._parse_text_response(content))
             
             return {"summary": "", "automation_pitch": "", "industry": ""}
             
@@ -334,6 +798,53 @@ class LeadEnrichmentBot:
             logger.error(f"Gemini API error for {company_name}: {e}")
             return {"summary": "", "automation_pitch": "", "industry": ""}
     
+    def analyze_company(self, company_name: str, website_content: str, industry: Optional[str] = None,
+                        use_cache: bool = True) -> Dict[str, str]:
+        """Analyze with the LLMs; an industry classified upstream overrides theirs"""
+        analysis = self._analyze_hedged(company_name, website_content, industry, use_cache)
+        if industry:
+            analysis = {**analysis, "industry": industry}
+        return analysis
+    
+    def _analyze_hedged(self, company_name: str, website_content: str, industry: Optional[str],
+                        use_cache: bool = True) -> Dict[str, str]:
+        """Analyze with Groq, hedging with Gemini when Groq is slow or comes back empty"""
+        executor = ThreadPoolExecutor(max_workers=2)
+        settled = threading.Event()
+        try:
+            futures = []
+            if self._groq_available():
+                prompt = self._groq_prompt(company_name, website_content, industry)
+                cached = self._cached_analysis(llm_cache_key(GROQ_MODEL, prompt), use_cache)
+                if cached:
+                    logger.info(f"Using cached Groq analysis for {company_name}")
+                    return cached
+                
+                # Wait for rate-limit budget here, so the hedge delay only times Groq itself
+                self._reserve_groq_budget(prompt)
+                groq_future = executor.submit(self._request_groq_analysis, company_name, prompt, settled)
+                futures.append(groq_future)
+                try:
+                    analysis = groq_future.result(timeout=LLM_HEDGE_DELAY)
+                    if analysis and analysis.get("summary"):
+                        return analysis
+                    logger.info("Groq analysis failed, trying Gemini...")
+                except FuturesTimeoutError:
+                    logger.info(f"Groq slower than {LLM_HEDGE_DELAY}s, racing Gemini...")
+            
+            futures.append(executor.submit(self.analyze_with_gemini, company_name, website_content, use_cache))
+            
+            # First non-empty answer wins; otherwise keep the last (empty) one
+            for future in as_completed(futures):
+                analysis = future.result()
+                if analysis and analysis.get("summary"):
+                    return analysis
+            return analysis
+        finally:
+            # Don't wait on (or start) the losing provider
+            settled.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+    
     def _parse_text_response(self, content: str) -> Dict[str, str]:
         """Parse text response when JSON parsing fails"""
         logger.info("Using fallback text parsing")
@@ -377,8 +888,9 @@ class LeadEnrichmentBot:
         
         return result
     
-    def enrich_company(self, company_name: str) -> CompanyData:
-        """Enrich a single company with all available data"""
+    def enrich_company(self, company_name: str, name_variants: Optional[List[str]] = None,
+                       use_cache: bool = True) -> CompanyData:
+        """Enrich a single company with all available data (use_cache=False forces fresh lookups and LLM calls)"""
         logger.info(f"=== Starting enrichment for: {company_name} ===")
         
         # Initialize company data
@@ -387,14 +899,12 @@ class LeadEnrichmentBot:
         try:
             # Step 1: Find website
             logger.info("Step 1: Finding website...")
-            company.website = self.search_company_website(company_name)
+            company.website = self.search_company_website(company_name, name_variants, use_cache)
             
             if not company.website:
                 logger.warning(f"No website found for {company_name}")
                 # Try to get basic info from AI without website content
-                analysis = self.analyze_with_groq(company_name, f"Company name: {company_name}")
-                if not analysis or not analysis.get("summary"):
-                    analysis = self.analyze_with_gemini(company_name, f"Company name: {company_name}")
+                analysis = self.analyze_company(company_name, f"Company name: {company_name}", use_cache=use_cache)
                 
                 company.summary = analysis.get("summary", f"Company information for {company_name} not available")
                 company.industry = analysis.get("industry", "Unknown")
@@ -405,7 +915,7 @@ class LeadEnrichmentBot:
             
             # Step 2: Scrape website content
             logger.info("Step 2: Scraping website content...")
-            website_content = self.scrape_website_content(company.website)
+            website_content = self.scrape_website_content(company.website, use_cache)
             
             if not website_content:
                 logger.warning(f"No content scraped from {company.website}")
@@ -413,14 +923,32 @@ class LeadEnrichmentBot:
             else:
                 logger.info(f"✅ Content scraped: {len(website_content)} characters")
             
-            # Step 3: Analyze with AI (try Groq first, then Gemini)
+            # Skip the LLM round trip for pages too thin (or known) to yield a useful analysis
+            fingerprint = content_fingerprint(website_content)
+            with self._cache_lock:
+                known_junk = use_cache and fingerprint in self._junk_fingerprints
+            if len(website_content) < MIN_LLM_CONTENT_LENGTH or known_junk:
+                logger.info(f"Low-signal content for {company_name}, skipping AI analysis")
+                company.summary = f"{company_name} ({company.website}): not enough public website content to summarize"
+                company.industry = guess_industry_from_domain(company.website)
+                company.automation_pitch = "Contact QF Innovate for custom AI automation solutions"
+                # Often just a failed scrape (timeout, 403, 5xx); worth retrying next time
+                company.cacheable = False
+                return company
+            
+            # Step 3: Analyze with AI (Groq first, Gemini hedged alongside)
             logger.info("Step 3: Analyzing with AI...")
-            analysis = self.analyze_with_groq(company_name, website_content)
             
-            # If Groq fails or returns empty results, try Gemini
-            if not analysis or not analysis.get("summary"):
-                logger.info("Groq analysis failed, trying Gemini...")
-                analysis = self.analyze_with_gemini(company_name, website_content)
+            # Obvious industries are classified locally, leaving Groq a shorter prompt
+            industry = classify_industry(website_content)
+            if industry:
+                logger.info(f"Industry classified locally: {industry}")
+            
+            analysis = self.analyze_company(company_name, website_content, industry, use_cache)
+            # Errors and outages come back without the flag and don't mark the page
+            if analysis.get("unsummarizable"):
+                with self._cache_lock:
+                    self._junk_fingerprints[fingerprint] = True
             
             company.summary = analysis.get("summary", "")
             company.industry = analysis.get("industry", "")
@@ -434,53 +962,116 @@ class LeadEnrichmentBot:
         except Exception as e:
             logger.error(f"Error during enrichment of {company_name}: {e}")
             company.summary = f"Error during processing: {str(e)}"
-        
-        # Add delay to be respectful to APIs
-        time.sleep(REQUEST_DELAY)
+            company.cacheable = False
         
         logger.info(f"=== Completed enrichment for: {company_name} ===\n")
         return company
     
-    def process_csv(self, input_csv_path: str, output_csv_path: str) -> pd.DataFrame:
-        """Process the entire CSV file"""
-        df = pd.read_csv(input_csv_path)
+    def _enrich_row(self, idx: int, company_name: str, name_variants: Optional[List[str]] = None) -> Dict[str, str]:
+        """Enrich one CSV row, turning any failure into an error row"""
+        logger.info(f"\n{'='*50}")
+        logger.info(f"Processing {idx + 1}: {company_name}")
+        logger.info(f"{'='*50}")
         
-        if 'company_name' not in df.columns:
+        try:
+            company_data = self.enrich_company(company_name, name_variants)
+            return {
+                'company_name': company_data.name,
+                'website': company_data.website,
+                'industry': company_data.industry,
+                'summary_from_llm': company_data.summary,
+                'automation_pitch_from_llm': company_data.automation_pitch
+            }
+        except Exception as e:
+            logger.error(f"Critical error processing {company_name}: {e}")
+            return {
+                'company_name': company_name,
+                'website': '',
+                'industry': '',
+                'summary_from_llm': f'Processing error: {str(e)}',
+                'automation_pitch_from_llm': ''
+            }
+    
+    def _enrich_rows(self, executor: ThreadPoolExecutor, start_idx: int, company_names: List[str],
+                     name_variants: List[List[str]]) -> Iterator[Dict[str, str]]:
+        """Enrich a batch of companies on a thread pool, yielding rows in input order"""
+        return executor.map(
+            self._enrich_row,
+            range(start_idx, start_idx + len(company_names)),
+            company_names,
+            name_variants
+        )
+    
+    def _enrich_in_processes(self, process_pool: ProcessPoolExecutor, processes: int, threads: int, start_idx: int,
+                             company_names: List[str], name_variants: List[List[str]]) -> Iterator[Dict[str, str]]:
+        """Shard a batch across worker processes, yielding rows in input order"""
+        bot_kwargs = {'groq_api_key': self.groq_api_key, 'gemini_api_key': self.gemini_api_key}
+        shard_size = -(-len(company_names) // processes)  # ceiling division
+        futures = [
+            process_pool.submit(
+                _enrich_shard, bot_kwargs, threads, start_idx + offset,
+                company_names[offset:offset + shard_size], name_variants[offset:offset + shard_size]
+            )
+            for offset in range(0, len(company_names), shard_size)
+        ]
+        for future in futures:
+            yield from future.result()
+    
+    def process_csv(self, input_csv_path: str, output_csv_path: str) -> pd.DataFrame:
+        """Process the entire CSV file, writing each enriched row as soon as it is ready"""
+        if 'company_name' not in pd.read_csv(input_csv_path, nrows=0).columns:
             raise ValueError("CSV must contain 'company_name' column")
         
-        enriched_data = []
-        total_companies = len(df)
+        # With several processes the ENRICH_CONCURRENCY budget is split between them
+        processes = max(1, ENRICH_PROCESSES)
+        threads = max(1, ENRICH_CONCURRENCY // processes)
+        process_pool = ProcessPoolExecutor(max_workers=processes) if processes > 1 else None
         
-        for idx, row in df.iterrows():
-            company_name = str(row['company_name']).strip()
-            logger.info(f"\n{'='*50}")
-            logger.info(f"Processing {idx + 1}/{total_companies}: {company_name}")
-            logger.info(f"{'='*50}")
-            
-            try:
-                company_data = self.enrich_company(company_name)
-                enriched_data.append({
-                    'company_name': company_data.name,
-                    'website': company_data.website,
-                    'industry': company_data.industry,
-                    'summary_from_llm': company_data.summary,
-                    'automation_pitch_from_llm': company_data.automation_pitch
-                })
-            except Exception as e:
-                logger.error(f"Critical error processing {company_name}: {e}")
-                enriched_data.append({
-                    'company_name': company_name,
-                    'website': '',
-                    'industry': '',
-                    'summary_from_llm': f'Processing error: {str(e)}',
-                    'automation_pitch_from_llm': ''
-                })
-        
-        output_df = pd.DataFrame(enriched_data)
-        output_df.to_csv(output_csv_path, index=False)
-        logger.info(f"\n✅ Results saved to {output_csv_path}")
-        
-        return output_df
+        processed = 0
+        try:
+            with open(output_csv_path, 'w', newline='', encoding='utf-8') as output_file, \
+                    ThreadPoolExecutor(max_workers=threads) as executor:
+                writer = csv.DictWriter(output_file, fieldnames=OUTPUT_CSV_COLUMNS)
+                writer.writeheader()
+                
+                for chunk in pd.read_csv(input_csv_path, usecols=['company_name'], chunksize=CSV_CHUNK_SIZE):
+                    names = chunk['company_name'].astype(str).str.strip()
+                    company_names = names.tolist()
+                    name_variants = domain_name_variants(names)
+                    
+                    # Every step is network-bound, so overlap companies either way
+                    if process_pool is None:
+                        rows = self._enrich_rows(executor, processed, company_names, name_variants)
+                    else:
+                        rows = self._enrich_in_processes(
+                            process_pool, processes, threads, processed, company_names, name_variants
+                        )
+                    
+                    for row in rows:
+                        # Flush per row so an interrupted run keeps everything done so far
+                        writer.writerow(row)
+                        output_file.flush()
+                    processed += len(company_names)
+        finally:
+            if process_pool is not None:
+                process_pool.shutdown()
+        
+        logger.info(f"\n✅ Results saved to {output_csv_path} ({processed} companies)")
+        
+        return pd.read_csv(output_csv_path, dtype=str, keep_default_na=False)
+
+# Per-process bot for process_csv's worker processes
+_worker_bot: Optional[LeadEnrichmentBot] = None
+
+def _enrich_shard(bot_kwargs: Dict[str, str], threads: int, start_idx: int, company_names: List[str],
+                  name_variants: List[List[str]]) -> List[Dict[str, str]]:
+    """Worker-process entry point: enrich a slice of companies with this process's own bot"""
+    global _worker_bot
+    # Sessions and locks don't survive crossing a process boundary, so build the bot here
+    if _worker_bot is None:
+        _worker_bot = LeadEnrichmentBot(**bot_kwargs)
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(_worker_bot._enrich_rows(executor, start_idx, company_names, name_variants))
 
 def main():
     # Initialize bot
@@ -493,7 +1084,7 @@ def main():
         print(f"📊 Processed {len(result_df)} companies")
         
         # Show success rate
-        successful = len(result_df[result_df['website'] != ''])
+        successful = int((result_df['website'].to_numpy() != '').sum())
         success_rate = (successful / len(result_df)) * 100 if len(result_df) > 0 else 0
         print(f"📈 Success rate: {success_rate:.1f}% ({successful}/{len(result_df)})")
         
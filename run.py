@@ -3,9 +3,8 @@
 Quick start script for the Lead Enrichment Bot
 """
 import sys
-import os
 import argparse
-from pathlib import Path
+from importlib.metadata import distribution, PackageNotFoundError
 
 def check_requirements():
     """Check if all required packages are installed"""
@@ -13,19 +12,13 @@ def check_requirements():
         'pandas', 'requests', 'beautifulsoup4', 'streamlit'
     ]
     
+    # Check installed distributions without importing them
     missing_packages = []
     for package in required_packages:
         try:
-            __import__(package)
-        except ImportError:
-            # Handle package name differences
-            if package == 'beautifulsoup4':
-                try:
-                    import bs4
-                except ImportError:
-                    missing_packages.append(package)
-            else:
-                missing_packages.append(package)
+            distribution(package)
+        except PackageNotFoundError:
+            missing_packages.append(package)
     
     if missing_packages:
         print("❌ Missing required packages:")
@@ -46,20 +39,22 @@ def check_api_key():
 def create_sample_csv():
     """Create a sample input CSV if it doesn't exist"""
     sample_file = "sample_companies.csv"
-    if not Path(sample_file).exists():
-        sample_data = """company_name
+    
+    sample_data = """company_name
 OpenAI
 DeepMind
 Zoho
 Freshworks
 Stripe"""
-        
-        with open(sample_file, 'w') as f:
+    
+    # Exclusive create doubles as the existence check
+    try:
+        with open(sample_file, 'x', encoding='utf-8') as f:
             f.write(sample_data)
-        
-        print(f"📄 Created sample CSV: {sample_file}")
+    except FileExistsError:
         return sample_file
     
+    print(f"📄 Created sample CSV: {sample_file}")
     return sample_file
 
 def run_cli_mode(input_file, output_file):
@@ -82,7 +77,7 @@ def run_cli_mode(input_file, output_file):
         print(f"💾 Results saved to: {output_file}")
         
         # Show summary
-        successful = len(result_df[result_df['website'] != ''])
+        successful = int((result_df['website'].to_numpy() != '').sum())
         print(f"🎯 Success rate: {successful}/{len(result_df)} ({successful/len(result_df)*100:.1f}%)")
         
     except ImportError as e:
@@ -95,7 +90,6 @@ def run_streamlit_mode():
     """Run the Streamlit web interface"""
     try:
         import streamlit.web.cli as stcli
-        import sys
         
         print("🌐 Starting Streamlit web interface...")
         print("📱 The app will open in your browser automatically")
@@ -150,8 +144,9 @@ def main():
     if not check_requirements():
         return 1
     
-    # Create sample CSV
-    sample_file = create_sample_csv()
+    # Create sample CSV (the web app has its own sample download)
+    if args.setup_only or args.mode == 'cli':
+        sample_file = create_sample_csv()
     
     if args.setup_only:
         print("✅ Setup complete!")
@@ -1,12 +1,29 @@
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 import io
 import os
-from lead_enrichment_bot import LeadEnrichmentBot
+import csv
+import codecs
 import tempfile
+from config import ENRICH_CONCURRENCY, ENRICHMENT_CACHE_PATH, ENRICHMENT_CACHE_TTL, GROQ_MODEL, UPLOAD_CHUNK_SIZE
+import hashlib
+from charset_normalizer import from_bytes
+from charset_normalizer.utils import is_multi_byte_encoding
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 import traceback
-from io import StringIO
+
+# Rows of the results table sent to the browser; the download has everything
+RESULTS_PREVIEW_ROWS = 200
+
+# Non-UTF-8 uploads: bytes sniffed, and how much more coherent than cp1252 a
+# charset_normalizer guess must be to be used instead
+ENCODING_SNIFF_BYTES = 65536
+ENCODING_COHERENCE_MARGIN = 0.1
+
+RESULT_COLUMNS = ['company_name', 'website', 'industry', 'summary_from_llm', 'automation_pitch_from_llm']
 
 # Configure page
 st.set_page_config(
@@ -28,6 +45,13 @@ def main():
         st.info("Using Groq for faster, more accurate results")
         st.info("Gemini API as fallback if needed")
         
+        # Reuse recent results instead of re-scraping and re-prompting
+        use_cache = st.checkbox(
+            "Use cache",
+            value=True,
+            help="Reuse results for companies enriched in the last 7 days"
+        )
+        
         st.markdown("---")
         
         # Instructions
@@ -68,29 +92,19 @@ def main():
         
         if uploaded_file is not None:
             try:
-                # Reset file pointer and read with proper encoding
-                uploaded_file.seek(0)
-                
-                # Try to read with different encodings
-                try:
-                    df = pd.read_csv(uploaded_file, encoding='utf-8')
-                except UnicodeDecodeError:
-                    uploaded_file.seek(0)
-                    df = pd.read_csv(uploaded_file, encoding='latin-1')
-                except Exception:
-                    uploaded_file.seek(0)
-                    df = pd.read_csv(uploaded_file, encoding='cp1252')
+                # Parsing is cached on the file contents, so reruns skip it
+                df, raw_rows = load_and_clean_csv(uploaded_file.getvalue())
                 
                 # Validate the dataframe
-                if df.empty:
+                if raw_rows == 0:
                     st.error("❌ The CSV file is empty")
                     return
                 
                 # Check for company_name column (case insensitive)
-                columns_lower = [col.lower().strip() for col in df.columns]
+                columns_lower = {str(col).lower().strip(): col for col in df.columns}
                 if 'company_name' not in columns_lower:
                     # Try to find similar column names
-                    possible_cols = [col for col in df.columns if 'company' in col.lower() or 'name' in col.lower()]
+                    possible_cols = [col for lower, col in columns_lower.items() if 'company' in lower or 'name' in lower]
                     if possible_cols:
                         st.warning(f"⚠️ 'company_name' column not found. Did you mean: {possible_cols}?")
                         st.info("Please rename your column to 'company_name' or select the correct column:")
@@ -103,12 +117,6 @@ def main():
                         st.info(f"Found columns: {list(df.columns)}")
                         return
                 
-                # Clean the data
-                if 'company_name' in df.columns:
-                    df = df.dropna(subset=['company_name'])
-                    df = df[df['company_name'].astype(str).str.strip() != '']
-                    df['company_name'] = df['company_name'].astype(str).str.strip()
-                
                 if df.empty:
                     st.error("❌ No valid company names found after cleaning")
                     return
@@ -144,17 +152,21 @@ def main():
             df = st.session_state.uploaded_df
             if st.button("🔄 Start Enrichment Process", type="primary"):
                 # Run enrichment with the validated dataframe
-                run_enrichment_with_df(df)
+                run_enrichment_with_df(df, use_cache=use_cache)
         elif uploaded_file is not None:
             st.info("📝 Please wait for file validation to complete")
         else:
             st.info("📝 Please upload a CSV file to start enrichment")
             
         # Display results section
-        if 'enrichment_results' in st.session_state:
+        results_path = st.session_state.get('results_path')
+        if results_path and os.path.exists(results_path):
             st.header("📈 Enrichment Results")
             
-            results_df = st.session_state.enrichment_results
+            results_stats = st.session_state.results_stats
+            total = results_stats['total']
+            if not results_stats.get('complete', True):
+                st.warning(f"⚠️ The last run was interrupted; showing the {total} companies finished before it stopped")
             
             # Success metrics
             col_a, col_b, col_c = st.columns(3)
@@ -162,132 +174,317 @@ def main():
             with col_a:
                 st.metric(
                     "Total Companies", 
-                    len(results_df)
+                    total
                 )
             
             with col_b:
-                successful = len(results_df[results_df['website'] != ''])
+                successful = results_stats['successful']
                 st.metric(
                     "Successfully Enriched", 
                     successful,
-                    delta=f"{successful/len(results_df)*100:.1f}%"
+                    delta=f"{successful/total*100:.1f}%" if total else None
                 )
             
             with col_c:
-                avg_summary_length = results_df['summary_from_llm'].str.len().mean()
+                avg_summary_length = results_stats['summary_chars'] / total if total else 0
                 st.metric(
                     "Avg Summary Length", 
-                    f"{avg_summary_length:.0f} chars" if not pd.isna(avg_summary_length) else "0 chars"
+                    f"{avg_summary_length:.0f} chars"
                 )
             
-            # Download enriched data
-            csv_data = results_df.to_csv(index=False)
+            # Cache effectiveness for the last run
+            cache_stats = st.session_state.get('cache_stats')
+            if cache_stats:
+                col_d, col_e = st.columns(2)
+                
+                with col_d:
+                    st.metric("Cache Hits", cache_stats['hits'])
+                
+                with col_e:
+                    st.metric("Cache Misses", cache_stats['misses'])
             
-            st.download_button(
-                label="📥 Download Enriched Data",
-                data=csv_data,
-                file_name=f"enriched_companies_{int(time.time())}.csv",
-                mime="text/csv",
-                type="primary"
-            )
+            # Download enriched data straight from the file written during the run
+            with open(results_path, 'rb') as results_file:
+                st.download_button(
+                    label="📥 Download Enriched Data",
+                    data=results_file.read(),
+                    file_name=f"enriched_companies_{int(time.time())}.csv",
+                    mime="text/csv",
+                    type="primary"
+                )
             
             # Display results table
             st.subheader("📋 Detailed Results")
-            st.dataframe(results_df, use_container_width=True)
+            st.dataframe(load_results_preview(results_path), use_container_width=True)
+            if total > RESULTS_PREVIEW_ROWS:
+                st.caption(f"Showing {RESULTS_PREVIEW_ROWS} of {total}. Download the full CSV above.")
 
-def run_enrichment_with_df(df):
+def detect_csv_encoding(file_bytes):
+    """Guess the encoding of an uploaded CSV from its first 64KB"""
+    head = file_bytes[:ENCODING_SNIFF_BYTES]
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    
+    # Valid UTF-8 is almost never an accident (a cut-off character at the end of the head is fine)
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=len(file_bytes) <= ENCODING_SNIFF_BYTES)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    
+    # Non-UTF-8 uploads are nearly always Western Excel exports (cp1252), and the
+    # single-byte code pages charset_normalizer likes to propose instead (cp1250,
+    # cp852, ...) garble their accents. Only switch when cp1252 is clearly worse.
+    matches = from_bytes(head)
+    best = matches.best()
+    # Matches that decode identically are merged, so look at every charset a match could be
+    if best is None or not best.encoding or 'cp1252' in best.could_be_from_charset:
+        return 'cp1252'
+    if is_multi_byte_encoding(best.encoding):
+        return best.encoding
+    
+    cp1252 = next((match for match in matches if 'cp1252' in match.could_be_from_charset), None)
+    if cp1252 is None or best.coherence >= cp1252.coherence + ENCODING_COHERENCE_MARGIN:
+        return best.encoding
+    return 'cp1252'
+
+def clean_company_names(names):
+    """Strip names and drop missing, blank and 'nan'/'none' entries"""
+    names = names.astype('string').str.strip()
+    mask = names.notna() & (names != '') & ~names.str.lower().isin({'nan', 'none'})
+    return pd.DataFrame({'company_name': names[mask]})
+
+@st.cache_data(show_spinner=False)
+def load_and_clean_csv(file_bytes):
+    """Parse an uploaded CSV and clean its company_name column
+    
+    Returns the cleaned frame and the number of data rows in the file before cleaning.
+    """
+    # Only the head is sniffed, so don't fail on a stray byte further down
+    read_options = {'encoding': detect_csv_encoding(file_bytes), 'encoding_errors': 'replace'}
+    
+    # Accept 'Company_Name', ' company_name ' etc. as the company column
+    header = pd.read_csv(io.BytesIO(file_bytes), nrows=0, **read_options).columns
+    columns_lower = {str(col).lower().strip(): col for col in header}
+    if 'company_name' not in columns_lower:
+        # Keep every column so the user can pick the right one
+        df = pd.read_csv(io.BytesIO(file_bytes), **read_options)
+        return df, len(df)
+    
+    # Parse only the company column, cleaning chunk by chunk to bound memory.
+    # Arrow's multi-threaded reader is tried first; the C engine copes with
+    # whatever it rejects (bad bytes, ragged rows, ...).
+    company_col = columns_lower['company_name']
+    try:
+        chunks, raw_rows = [], 0
+        batches = pa_csv.open_csv(
+            io.BytesIO(file_bytes),
+            read_options=pa_csv.ReadOptions(encoding=read_options['encoding']),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=[company_col],
+                column_types={company_col: pa.string()},
+                strings_can_be_null=True
+            )
+        )
+        for batch in batches:
+            raw_rows += batch.num_rows
+            chunks.append(clean_company_names(batch.column(0).to_pandas()))
+    except (pa.ArrowException, UnicodeDecodeError):
+        chunks, raw_rows = [], 0
+        reader = pd.read_csv(io.BytesIO(file_bytes), usecols=[company_col], chunksize=UPLOAD_CHUNK_SIZE, **read_options)
+        for chunk in reader:
+            raw_rows += len(chunk)
+            chunks.append(clean_company_names(chunk[company_col]))
+    
+    if not chunks:
+        return pd.DataFrame({'company_name': pd.Series(dtype='string')}), raw_rows
+    
+    return pd.concat(chunks, ignore_index=True), raw_rows
+
+@st.cache_data(show_spinner=False)
+def load_results_preview(results_path):
+    """Read the first rows of a finished run's results file"""
+    return pd.read_csv(results_path, nrows=RESULTS_PREVIEW_ROWS, dtype=str, keep_default_na=False)
+
+@st.cache_resource(show_spinner=False)
+def get_bot():
+    """One LeadEnrichmentBot for the whole app (it is safe to share across threads)
+    
+    All enrichment workers go through the bot's single requests.Session, so
+    TLS connections to the LLM APIs and probed sites are kept alive across
+    companies and across runs instead of being re-negotiated per company.
+    """
+    # The bot pulls in scraping and LLM dependencies, so only load it once a run starts
+    from lead_enrichment_bot import LeadEnrichmentBot
+    return LeadEnrichmentBot()
+
+def enrichment_cache_key(company_name):
+    """Cache key for a company enriched with the current model"""
+    return hashlib.sha256(f"{company_name.lower().strip()}|{GROQ_MODEL}".encode()).hexdigest()
+
+def run_enrichment_with_df(df, use_cache=True):
     """Run the enrichment process with a pre-validated dataframe"""
+    from lead_enrichment_bot import ResponseCache
     
     # Initialize progress tracking
     progress_bar = st.progress(0)
     status_text = st.empty()
+    last_result = st.empty()
+    cache = None
     
     try:
-        total_companies = len(df)
-        
         status_text.text("🔧 Initializing AI bot with Groq...")
         
-        # Initialize bot (will use config values)
-        bot = LeadEnrichmentBot()
+        # Shared bot, so its HTTP pool, caches and rate limits survive reruns
+        bot = get_bot()
         
         # Process companies with progress tracking
-        enriched_data = []
+        # Names were already stripped and filtered when the CSV was loaded
+        company_names = df['company_name'].reset_index(drop=True)
+        
+        # Enrich each distinct company once; duplicates are filled in afterwards
+        name_keys = company_names.str.lower()
+        unique_names = company_names[~name_keys.duplicated()]
+        if len(unique_names) < len(company_names):
+            st.info(f"Deduped {len(company_names) - len(unique_names)} duplicate names")
+        
+        total_companies = len(unique_names)
+        results_by_key = {}
+        failures = []
         
-        for idx, row in df.iterrows():
-            company_name = str(row['company_name']).strip()
+        # Companies enriched recently are served from the on-disk cache
+        cache = ResponseCache(ENRICHMENT_CACHE_PATH, ttl=ENRICHMENT_CACHE_TTL) if use_cache else None
+        pending = []
+        for company_name in unique_names:
+            cached = cache.get(enrichment_cache_key(company_name)) if cache is not None else None
+            if cached:
+                results_by_key[company_name.lower()] = cached
+            else:
+                pending.append(company_name)
+        
+        # Redraw progress about 100 times per run rather than once per company
+        progress_step = max(1, total_companies // 100)
+        
+        # Rows are written to disk as soon as they (and every row before them) are
+        # done, so an interrupted run keeps its results and nothing is re-serialized later
+        row_names = company_names.tolist()
+        row_keys = name_keys.tolist()
+        results_stats = {'total': 0, 'successful': 0, 'summary_chars': 0, 'complete': False}
+        next_row = 0
+        
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', newline='', encoding='utf-8', delete=False) as results_file:
+            writer = csv.DictWriter(results_file, fieldnames=RESULT_COLUMNS)
+            writer.writeheader()
             
-            # Skip empty names
-            if not company_name or company_name.lower() in ['nan', 'none', '']:
-                continue
+            # Point the results panel at this run's file right away, so rows finished
+            # before a Stop or a crash can still be downloaded (and the file gets replaced later)
+            previous_path = st.session_state.get('results_path')
+            if previous_path and os.path.exists(previous_path):
+                os.remove(previous_path)
+            st.session_state.results_path = results_file.name
+            st.session_state.results_stats = results_stats
             
-            # Update progress
-            progress = (idx + 1) / total_companies
-            progress_bar.progress(progress)
-            status_text.text(f"🔍 Processing {idx + 1}/{total_companies}: {company_name}")
+            def write_ready_rows():
+                nonlocal next_row
+                while next_row < len(row_keys) and row_keys[next_row] in results_by_key:
+                    # Keep each row's own spelling of the name
+                    row = {**results_by_key[row_keys[next_row]], 'company_name': row_names[next_row]}
+                    writer.writerow(row)
+                    results_stats['total'] += 1
+                    results_stats['successful'] += row['website'] != ''
+                    results_stats['summary_chars'] += len(row['summary_from_llm'] or '')
+                    next_row += 1
+                results_file.flush()
             
+            write_ready_rows()
+            
+            # Enrichment is network-bound, so keep several companies in flight.
+            # Streamlit calls must stay on this thread, so the UI is updated from the as_completed loop.
+            executor = ThreadPoolExecutor(max_workers=ENRICH_CONCURRENCY)
             try:
-                # Call the enrichment method
-                company_data = bot.enrich_company(company_name)
-                
-                # Extract data from CompanyData object
-                enriched_data.append({
-                    'company_name': company_data.name,
-                    'website': company_data.website,
-                    'industry': company_data.industry,
-                    'summary_from_llm': company_data.summary,
-                    'automation_pitch_from_llm': company_data.automation_pitch
-                })
+                futures = {
+                    # Unchecking "Use cache" also bypasses the bot's own lookup and LLM caches
+                    executor.submit(bot.enrich_company, company_name, use_cache=use_cache): company_name
+                    for company_name in pending
+                }
                 
-                # Show progress with actual data
-                with st.expander(f"✅ Processed: {company_name}", expanded=False):
-                    st.write(f"**Website:** {company_data.website}")
-                    st.write(f"**Industry:** {company_data.industry}")
-                    st.write(f"**Summary:** {company_data.summary[:200]}...")
-                    st.write(f"**Automation Pitch:** {company_data.automation_pitch[:200]}...")
+                for done, future in enumerate(as_completed(futures), start=len(results_by_key) + 1):
+                    company_name = futures[future]
                     
-            except Exception as e:
-                error_msg = f"Error processing {company_name}: {str(e)}"
-                st.error(f"❌ {error_msg}")
-                
-                # Add empty row for failed companies
-                enriched_data.append({
-                    'company_name': company_name,
-                    'website': '',
-                    'industry': '',
-                    'summary_from_llm': error_msg,
-                    'automation_pitch_from_llm': ''
-                })
-            
-            # Add small delay to prevent rate limiting
-            time.sleep(0.1)
+                    # Update progress
+                    if done % progress_step == 0 or done == total_companies:
+                        progress_bar.progress(done / total_companies)
+                        status_text.text(f"🔍 Processed {done}/{total_companies}: {company_name}")
+                    
+                    try:
+                        company_data = future.result()
+                        
+                        # Extract data from CompanyData object
+                        results_by_key[company_name.lower()] = {
+                            'company_name': company_data.name,
+                            'website': company_data.website,
+                            'industry': company_data.industry,
+                            'summary_from_llm': company_data.summary,
+                            'automation_pitch_from_llm': company_data.automation_pitch
+                        }
+                        
+                        # Only cache real LLM results, not errors or placeholders for failed scrapes
+                        if cache is not None and company_data.cacheable and company_data.summary:
+                            cache.set(enrichment_cache_key(company_name), results_by_key[company_name.lower()])
+                        
+                        # Show the latest result in place instead of one expander per company
+                        last_result.write(f"✅ Last: {company_name} → {company_data.website or 'no website found'}")
+                        
+                    except Exception as e:
+                        error_msg = f"Error processing {company_name}: {str(e)}"
+                        failures.append({'company': company_name, 'error': str(e)})
+                        
+                        # Add empty row for failed companies
+                        results_by_key[company_name.lower()] = {
+                            'company_name': company_name,
+                            'website': '',
+                            'industry': '',
+                            'summary_from_llm': error_msg,
+                            'automation_pitch_from_llm': ''
+                        }
+                    
+                    write_ready_rows()
+            finally:
+                # A Stop click or widget change raises out of the UI calls above;
+                # drop the queued companies instead of finishing them first
+                executor.shutdown(wait=False, cancel_futures=True)
         
-        # Create results DataFrame
-        results_df = pd.DataFrame(enriched_data)
+        # Report failures together rather than one error box per company
+        if failures:
+            with st.expander(f"⚠️ {len(failures)} failures"):
+                st.dataframe(pd.DataFrame(failures), use_container_width=True)
         
         # Store in session state
-        st.session_state.enrichment_results = results_df
+        results_stats['complete'] = True
+        st.session_state.cache_stats = cache.stats if cache is not None else None
         
         # Success message
         progress_bar.progress(1.0)
         status_text.text("✅ Enrichment completed successfully!")
         
         # Show final statistics
-        successful = len(results_df[results_df['website'] != ''])
-        success_rate = (successful / len(results_df)) * 100 if len(results_df) > 0 else 0
+        total = results_stats['total']
+        successful = results_stats['successful']
+        success_rate = (successful / total) * 100 if total > 0 else 0
         
-        st.success(f"🎉 Successfully processed {len(results_df)} companies!")
-        st.info(f"📈 Success rate: {success_rate:.1f}% ({successful}/{len(results_df)} companies found)")
+        st.success(f"🎉 Successfully processed {total} companies!")
+        st.info(f"📈 Success rate: {success_rate:.1f}% ({successful}/{total} companies found)")
         
         st.balloons()
         
-        # Automatically show results
-        st.rerun()
-        
     except Exception as e:
         st.error(f"❌ Error during enrichment: {str(e)}")
         st.code(traceback.format_exc())
         progress_bar.empty()
         status_text.empty()
+    finally:
+        if cache is not None:
+            cache.close()
 
 def show_features():
     """Display features section"""